@@ -1,12 +1,18 @@
 BEGIN TRANSACTION;
 
-CREATE INDEX IF NOT EXISTS idx_students_room ON Students (room);
+CREATE INDEX IF NOT EXISTS idx_students_room_birthday ON Students (room, birthday_julian);
 
 COMMIT;
 
 
 BEGIN TRANSACTION;
 
-CREATE INDEX IF NOT EXISTS idx_students_birthday ON Students (birthday);
+CREATE INDEX IF NOT EXISTS idx_students_room_sex ON Students (room, sex);
+
+COMMIT;
+
+BEGIN TRANSACTION;
+
+ANALYZE;
 
 COMMIT;
\ No newline at end of file
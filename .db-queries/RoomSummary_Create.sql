@@ -0,0 +1,23 @@
+BEGIN TRANSACTION;
+
+CREATE TABLE IF NOT EXISTS RoomSummary (
+    room_id INTEGER PRIMARY KEY NOT NULL,
+    name TEXT NOT NULL,
+    students_count INTEGER NOT NULL,
+    avg_birthday_jd REAL,
+    min_birthday_jd REAL,
+    max_birthday_jd REAL,
+    distinct_sex INTEGER NOT NULL,
+    FOREIGN KEY (room_id) REFERENCES Rooms(id)
+);
+
+DELETE FROM RoomSummary;
+
+INSERT INTO RoomSummary
+SELECT Rooms.id, Rooms.name, COUNT(Students.id), AVG(Students.birthday_julian),
+MIN(Students.birthday_julian), MAX(Students.birthday_julian), COUNT(DISTINCT Students.sex)
+FROM Rooms
+LEFT JOIN Students ON Rooms.id = Students.room
+GROUP BY Rooms.id;
+
+COMMIT;
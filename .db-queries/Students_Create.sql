@@ -6,6 +6,7 @@ CREATE TABLE Students (
 	birthday DATETIME NOT NULL,
 	sex TEXT NOT NULL,
 	room INTEGER NOT NULL,
+	birthday_julian REAL GENERATED ALWAYS AS (JULIANDAY(birthday)) STORED,
 	FOREIGN KEY (room) REFERENCES Rooms(id)
 );
 
@@ -6,57 +6,471 @@ It includes methods to insert data into the 'Rooms' and 'Students' tables, and m
 """
 
 import logging
+import logging.handlers
+import queue
 import sqlite3
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from itertools import chain, islice
+from pathlib import Path
 from sqlite3 import Error
-from typing import Any, List, Tuple
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
 
+from log_settings import env_log_level
 
-logger = logging.getLogger("db_manager_logger")
-logger.setLevel(logging.INFO)
-handler = logging.FileHandler("logs/db_manager.log")
-handler.setLevel(logging.INFO)
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-handler.setFormatter(formatter)
 
-if not logger.hasHandlers():
+__all__ = ["DbManager"]
+
+logger = logging.getLogger("db_manager_logger")
+# The level defaults to WARNING so the loader does not pay for INFO records; set
+# LOG_LEVEL=INFO (or DEBUG) in the environment to trace a run.
+logger.setLevel(env_log_level())
+
+# The handlers are only built the first time the module is configured, so re-imports
+# (or an already configured root logger) do not open or attach duplicate handlers.
+if not logger.handlers:
+    file_handler = logging.FileHandler("logs/db_manager.log", delay=True)
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    file_handler.setFormatter(formatter)
+    # Records are buffered and written in batches; errors flush the buffer immediately.
+    handler = logging.handlers.MemoryHandler(
+        capacity=1024, flushLevel=logging.ERROR, target=file_handler
+    )
+    handler.setLevel(logging.DEBUG)
     logger.addHandler(handler)
 
 logger.propagate = False
 
+_INSERT_CHUNK_SIZE = 10_000
+
+_WRITE_BATCH_SIZE = 8
+
+# At most this many chunks wait for the storage worker; producers block beyond it,
+# so a large input is never held in memory all at once.
+_WRITE_QUEUE_SIZE = 2 * _WRITE_BATCH_SIZE
+
+_MULTI_INSERT_ROWS = 500
+
+# Database names that open a private in-memory (or temporary) database, which the
+# read-only pool connections could not share.
+_IN_MEMORY_PATHS = ("", ":memory:")
+
+_ROOMS_COLUMNS = ("id", "name")
+
+_STUDENTS_COLUMNS = ("id", "name", "birthday", "sex", "room")
+
+# Bumped (and handled in DbManager._migrate) whenever the schema in .db-queries changes.
+_SCHEMA_VERSION = 1
+
+# ALTER TABLE cannot add a STORED generated column, so databases created before
+# birthday_julian existed get it as a VIRTUAL one; it can be indexed all the same.
+_SQL_ADD_BIRTHDAY_JULIAN = """
+    ALTER TABLE Students
+    ADD COLUMN birthday_julian REAL GENERATED ALWAYS AS (JULIANDAY(birthday)) VIRTUAL
+"""
+
+_SQL_TASK1 = """
+    SELECT name, students_count
+    FROM RoomSummary
+    ORDER BY students_count DESC, name
+"""
+
+_INDEX_STATEMENTS = (
+    "CREATE INDEX IF NOT EXISTS idx_students_room_birthday ON Students (room, birthday_julian)",
+    "CREATE INDEX IF NOT EXISTS idx_students_room_sex ON Students (room, sex)",
+    "ANALYZE",
+)
+
+_SQL_CREATE_INDEXES = f"BEGIN IMMEDIATE; {'; '.join(_INDEX_STATEMENTS)}; COMMIT;"
+
+_SQL_CREATE_ROOM_SUMMARY = """
+    CREATE TABLE IF NOT EXISTS RoomSummary (
+        room_id INTEGER PRIMARY KEY NOT NULL,
+        name TEXT NOT NULL,
+        students_count INTEGER NOT NULL,
+        avg_birthday_jd REAL,
+        min_birthday_jd REAL,
+        max_birthday_jd REAL,
+        distinct_sex INTEGER NOT NULL,
+        FOREIGN KEY (room_id) REFERENCES Rooms(id)
+    )
+"""
+
+_REFRESH_ROOM_SUMMARY_STATEMENTS = (
+    _SQL_CREATE_ROOM_SUMMARY,
+    "DELETE FROM RoomSummary",
+    """
+    INSERT INTO RoomSummary
+    SELECT Rooms.id, Rooms.name, COUNT(Students.id), AVG(Students.birthday_julian),
+    MIN(Students.birthday_julian), MAX(Students.birthday_julian),
+    COUNT(DISTINCT Students.sex)
+    FROM Rooms
+    LEFT JOIN Students ON Rooms.id = Students.room
+    GROUP BY Rooms.id
+    """,
+)
+
+_SQL_REFRESH_ROOM_SUMMARY = (
+    f"BEGIN IMMEDIATE; {'; '.join(_REFRESH_ROOM_SUMMARY_STATEMENTS)}; COMMIT;"
+)
+
+_SQL_CLEAR_TABLES = f"""
+    BEGIN IMMEDIATE;
+    DROP INDEX IF EXISTS idx_students_room_birthday;
+    DROP INDEX IF EXISTS idx_students_room_sex;
+    DROP INDEX IF EXISTS idx_students_room;
+    DROP INDEX IF EXISTS idx_students_birthday;
+    DELETE FROM Students;
+    DELETE FROM Rooms;
+    {_SQL_CREATE_ROOM_SUMMARY};
+    DELETE FROM RoomSummary;
+    COMMIT;
+"""
+
+_SQL_TASK2 = """
+    WITH Now AS (SELECT JULIANDAY('now') AS jd)
+    SELECT name, ROUND((Now.jd - avg_birthday_jd) / 365.25, 3) AS avg_students_age
+    FROM Now, RoomSummary
+    WHERE students_count > 0
+    ORDER BY avg_students_age
+    LIMIT 5
+"""
+
+_SQL_TASK3 = """
+    SELECT name, ROUND((max_birthday_jd - min_birthday_jd) / 365.25, 3) AS age_difference
+    FROM RoomSummary
+    WHERE students_count > 0
+    ORDER BY age_difference DESC
+    LIMIT 5
+"""
+
+_SQL_TASK4 = """
+    SELECT name
+    FROM RoomSummary
+    WHERE distinct_sex > 1
+    ORDER BY name
+"""
+
+_SQL_ALL_TASKS = """
+    WITH Now AS (SELECT JULIANDAY('now') AS jd),
+    Ages AS (
+        SELECT name, students_count, distinct_sex,
+        ROUND((Now.jd - avg_birthday_jd) / 365.25, 3) AS avg_students_age,
+        ROUND((max_birthday_jd - min_birthday_jd) / 365.25, 3) AS age_difference
+        FROM Now, RoomSummary
+    )
+    SELECT 1 AS task, name, students_count AS value,
+    ROW_NUMBER() OVER (ORDER BY students_count DESC, name) AS position
+    FROM Ages
+    UNION ALL
+    SELECT * FROM (
+        SELECT 2, name, avg_students_age,
+        ROW_NUMBER() OVER (ORDER BY avg_students_age, name) AS position
+        FROM Ages
+        WHERE students_count > 0
+    ) WHERE position <= 5
+    UNION ALL
+    SELECT * FROM (
+        SELECT 3, name, age_difference,
+        ROW_NUMBER() OVER (ORDER BY age_difference DESC, name) AS position
+        FROM Ages
+        WHERE students_count > 0
+    ) WHERE position <= 5
+    UNION ALL
+    SELECT 4, name, NULL, ROW_NUMBER() OVER (ORDER BY name)
+    FROM Ages
+    WHERE distinct_sex > 1
+    ORDER BY task, position
+"""
+
+
+@contextmanager
+def _transaction(connection: sqlite3.Connection) -> Iterator[None]:
+    """
+    Runs the enclosed statements in a single BEGIN IMMEDIATE ... COMMIT transaction.
+    The write lock is taken up-front, and the transaction is rolled back on any error.
+    """
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        connection.rollback()
+        raise
+    connection.execute("COMMIT")
+
+
+def _multi_insert(
+    connection: sqlite3.Connection,
+    table: str,
+    columns: Tuple[str, ...],
+    rows: Iterable[Tuple[Any, ...]],
+    chunk: int = _MULTI_INSERT_ROWS,
+) -> int:
+    """
+    Inserts rows with multi-row INSERT ... VALUES (...), (...) statements, binding up to
+    chunk rows per statement, so each statement execution writes many rows at once.
+    The SQL text for a full chunk is built once and reused (and thus hits the same cached
+    prepared statement); only the final partial chunk needs a statement of its own.
+    The chunk is capped so a statement never binds more parameters than the connection's
+    SQLITE_LIMIT_VARIABLE_NUMBER allows (999 before SQLite 3.32, 32766 since).
+
+    Args:
+        connection (sqlite3.Connection): The connection to insert with.
+        table (str): The name of the table.
+        columns (Tuple[str, ...]): The names of the columns, in row order.
+        rows (Iterable[Tuple[Any, ...]]): The rows to insert.
+        chunk (int): The maximum number of rows per statement.
+
+    Returns:
+        int: The number of rows inserted.
+
+    Raises:
+        sqlite3.ProgrammingError: If a row does not have exactly one value per column,
+        as executemany would. The rows are flattened into one parameter list, so a short
+        or long row would otherwise shift values into its neighbours.
+    """
+    width = len(columns)
+    max_variables = connection.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+    chunk = max(1, min(chunk, max_variables // width))
+    prefix = f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+    placeholder = f"({', '.join('?' * len(columns))})"
+    full_sql = prefix + ", ".join([placeholder] * chunk)
+    rows = iter(rows)
+    count = 0
+    while block := list(islice(rows, chunk)):
+        for row in block:
+            if len(row) != width:
+                raise sqlite3.ProgrammingError(
+                    f"Incorrect number of bindings supplied for {table}: "
+                    f"{width} column(s), a row has {len(row)} value(s)"
+                )
+        if len(block) == chunk:
+            sql = full_sql
+        else:
+            sql = prefix + ", ".join([placeholder] * len(block))
+        connection.execute(sql, list(chain.from_iterable(block)))
+        count += len(block)
+    return count
+
+
+def _writer_loop(
+    write_queue: "queue.Queue[Optional[Tuple[object, str, Tuple[str, ...], List[Tuple[Any, ...]], Future]]]",
+    connection: sqlite3.Connection,
+    write_lock: threading.Lock,
+    on_write: Callable[[], None],
+) -> None:
+    """
+    Body of the storage worker thread.
+    Takes queued (call, table, columns, rows, future) inserts, drains up to _WRITE_BATCH_SIZE
+    consecutive chunks of the same call at a time and runs them in one transaction, then
+    resolves the futures with the number of rows inserted (or with the error, if the batch
+    was rolled back). Chunks of different calls are never batched together, so a failing
+    chunk cannot roll back the rows of another call. Stops when it receives None.
+
+    Args:
+        write_queue (queue.Queue): The queue of pending inserts.
+        connection (sqlite3.Connection): The write connection.
+        write_lock (threading.Lock): The lock serializing use of the write connection.
+        on_write (Callable[[], None]): Called under the write lock before each batch commits.
+    """
+    held = []
+    while True:
+        item = held.pop() if held else write_queue.get()
+        if item is None:
+            return
+        batch = [item]
+        while len(batch) < _WRITE_BATCH_SIZE:
+            try:
+                item = write_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None or item[0] is not batch[0][0]:
+                held.append(item)
+                break
+            batch.append(item)
+        try:
+            with write_lock, _transaction(connection):
+                for _, table, columns, rows, _ in batch:
+                    _multi_insert(connection, table, columns, rows)
+                on_write()
+        except Exception as e:
+            logger.error("Error writing queued rows: %s (%s)", e, type(e).__name__)
+            for *_, future in batch:
+                future.set_exception(e)
+        else:
+            for *_, rows, future in batch:
+                future.set_result(len(rows))
+
 
 class DbManager:
     """
     DbManager Class
 
-    This class manages the connection to an SQLite database and provides methods
+    This class manages the connections to an SQLite database and provides methods
     for inserting data into the 'Rooms' and 'Students' tables, as well as for executing
-    specific queries to retrieve data.
+    specific queries to retrieve data. Writes go through a single connection, while
+    read-only queries borrow a connection from a pool of read-only connections, so
+    under WAL they can run concurrently with each other and with the writer.
+    Inserts are handed to a background storage worker thread that batches them into
+    transactions, so the caller does not have to block on the commit.
+    Use it as a context manager (or call close()) so the connections are closed
+    deterministically instead of whenever the object happens to be finalized.
 
     Attributes:
-        connection (sqlite3.Connection): The SQLite database connection object.
+        connection (sqlite3.Connection): The SQLite database connection used for writes.
     """
 
-    def __init__(self, db_path: str = "database.db") -> None:
+    def __init__(
+        self,
+        db_path: str = "database.db",
+        journal_mode: str = "WAL",
+        synchronous: str = "NORMAL",
+        cache_size: int = -65536,
+        mmap_size: int = 268435456,
+        busy_timeout: int = 5000,
+        cached_statements: int = 256,
+        read_pool_size: int = 4,
+        wal_autocheckpoint: int = 1000,
+        locking_mode: str = "NORMAL",
+    ) -> None:
         """
-        Initializes the connection to the SQLite database.
-        Establishes a connection to db_path database. Raises an exception if the connection fails.
+        Initializes the connections to the SQLite database.
+        Establishes a write connection and read_pool_size read-only connections to
+        db_path database and tunes them for the bulk-insert and aggregation workload.
+        Raises an exception if a connection fails.
+
+        Args:
+            db_path (str): The path to the SQLite database file.
+            journal_mode (str): The journal mode (WAL lets readers run alongside a writer).
+            synchronous (str): The synchronous level (NORMAL is safe under WAL).
+            cache_size (int): The page cache size (negative values are in KiB).
+            mmap_size (int): The maximum number of bytes to memory-map.
+            busy_timeout (int): The number of milliseconds to wait on a locked database.
+            cached_statements (int): The number of prepared statements kept in the cache.
+            read_pool_size (int): The number of read-only connections in the pool. With 0,
+            or for an in-memory database (which other connections cannot see), read queries
+            run on the write connection instead.
+            wal_autocheckpoint (int): The WAL size in pages that triggers a checkpoint
+            (SQLite's default of 1000; bulk_load suspends it and checkpoints once at the end).
+            locking_mode (str): The locking mode of the write connection. EXCLUSIVE skips
+            re-acquiring the file locks per transaction, but locks out the read pool,
+            so it only suits a loader run with read_pool_size=0.
+
+        The connections run in autocommit mode (isolation_level=None), so every write
+        method opens its own explicit transaction.
         """
         self.connection = None
+        self._readers = queue.Queue()
+        self._read_pool_size = 0
+        self._wal_autocheckpoint = int(wal_autocheckpoint)
+        self._write_lock = threading.Lock()
+        self._write_queue = queue.Queue(maxsize=_WRITE_QUEUE_SIZE)
+        self._writer_thread = None
+        # Set whenever Rooms or Students may have changed since RoomSummary was rebuilt.
+        self._summary_stale = True
+        connection_pragmas = f"""
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size={int(cache_size)};
+            PRAGMA mmap_size={int(mmap_size)};
+            PRAGMA busy_timeout={int(busy_timeout)};
+        """
         try:
-            self.connection = sqlite3.connect(db_path)
+            self.connection = sqlite3.connect(
+                db_path,
+                isolation_level=None,
+                cached_statements=cached_statements,
+                check_same_thread=False,
+            )
+            self.connection.executescript(
+                f"""
+                PRAGMA journal_mode={journal_mode};
+                PRAGMA synchronous={synchronous};
+                PRAGMA wal_autocheckpoint={self._wal_autocheckpoint};
+                PRAGMA locking_mode={locking_mode};
+                PRAGMA foreign_keys=OFF;
+                {connection_pragmas}
+                """
+            )
+            self._migrate()
+            if db_path not in _IN_MEMORY_PATHS:
+                read_uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+                for _ in range(read_pool_size):
+                    reader = sqlite3.connect(
+                        read_uri,
+                        uri=True,
+                        isolation_level=None,
+                        cached_statements=cached_statements,
+                        check_same_thread=False,
+                    )
+                    self._readers.put(reader)
+                    self._read_pool_size += 1
+                    reader.executescript(f"PRAGMA query_only=1; {connection_pragmas}")
+            self._writer_thread = threading.Thread(
+                target=_writer_loop,
+                args=(
+                    self._write_queue,
+                    self.connection,
+                    self._write_lock,
+                    self._mark_summary_stale,
+                ),
+                name="StorageWorker",
+                daemon=True,
+            )
+            self._writer_thread.start()
             logger.info("Database connection established.")
         except Error as e:
             logger.error("Error connecting to the database: %s (%s)", e, type(e).__name__)
             raise
 
-    def __del__(self) -> None:
+    def _migrate(self) -> None:
+        """
+        Brings a database created from an older schema up to _SCHEMA_VERSION, tracked in
+        PRAGMA user_version: version 1 adds the generated 'birthday_julian' column to the
+        'Students' table. Databases without a 'Students' table are left untouched.
+
+        Raises:
+            Error: If an error occurs while executing the SQL queries.
+        """
+        (version,) = self.connection.execute("PRAGMA user_version").fetchone()
+        if version >= _SCHEMA_VERSION:
+            return
+        with self._write_lock, _transaction(self.connection):
+            columns = {
+                row[1] for row in self.connection.execute("PRAGMA table_xinfo(Students)")
+            }
+            if not columns:
+                return
+            if "birthday_julian" not in columns:
+                logger.info(
+                    "Adding the birthday_julian column to the 'Students' table..."
+                )
+                self.connection.execute(_SQL_ADD_BIRTHDAY_JULIAN)
+            self.connection.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+
+    def __enter__(self) -> "DbManager":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
         """
-        Closes the connection to the database upon object deletion.
-        Logs an error if the connection cannot be closed properly.
+        Stops the storage worker once the queued inserts are written, runs PRAGMA optimize
+        and closes the connections to the database. Calling it again has no effect.
+        Logs an error if the connections cannot be closed properly.
         """
+        if self._writer_thread:
+            self._write_queue.put(None)
+            self._writer_thread.join()
+            self._writer_thread = None
         if self.connection:
             try:
+                while not self._readers.empty():
+                    self._readers.get_nowait().close()
+                self.connection.execute("PRAGMA optimize")
                 self.connection.close()
+                self.connection = None
                 logger.info("Database connection closed.")
             except Error as e:
                 logger.error(
@@ -64,101 +478,260 @@ class DbManager:
                 )
                 raise
 
-    def insert_rooms(self, rooms: List[Tuple[int, str]]) -> None:
+    def _mark_summary_stale(self) -> None:
+        self._summary_stale = True
+
+    def _ensure_summary(self) -> None:
+        """
+        Rebuilds 'RoomSummary' if the data may have changed through this manager since
+        it was last built, so task1 - task4 never read a stale summary.
         """
-        Inserts room data into the 'Rooms' table.
+        if self._summary_stale:
+            self.refresh_summary()
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrows a read-only connection from the pool for the duration of the block,
+        waiting for one to be returned if all of them are in use.
+        Without a pool, the write connection is lent instead, under the write lock and
+        with PRAGMA query_only set for the duration of the block.
+        """
+        if not self._read_pool_size:
+            with self._write_lock:
+                self.connection.execute("PRAGMA query_only=1")
+                try:
+                    yield self.connection
+                finally:
+                    self.connection.execute("PRAGMA query_only=0")
+            return
+        reader = self._readers.get()
+        try:
+            yield reader
+        finally:
+            self._readers.put(reader)
+
+    def _enqueue_chunked(
+        self, table: str, columns: Tuple[str, ...], rows: Iterable[Tuple[Any, ...]]
+    ) -> List["Future[int]"]:
+        """
+        Splits the rows into chunks of _INSERT_CHUNK_SIZE and queues each chunk for the
+        storage worker. Rows are pulled lazily, so any iterable (including a generator)
+        is accepted, and the next chunk is prepared while the worker writes the previous one.
+        The queue is bounded, so this blocks while _WRITE_QUEUE_SIZE chunks are pending.
 
         Args:
-            rooms (List[Tuple[int, str]]): A list of tuples, each containing an ID and a name of a room.
+            table (str): The name of the table to insert into.
+            columns (Tuple[str, ...]): The names of the columns, in row order.
+            rows (Iterable[Tuple[Any, ...]]): The rows to insert.
+
+        Returns:
+            List[Future[int]]: One future per chunk, resolved with the number of rows written.
+        """
+        rows = iter(rows)
+        call = object()
+        futures = []
+        while chunk := list(islice(rows, _INSERT_CHUNK_SIZE)):
+            future = Future()
+            self._write_queue.put((call, table, columns, chunk, future))
+            futures.append(future)
+        return futures
+
+    def insert_rooms(
+        self, rooms: Iterable[Tuple[int, str]], wait: bool = True
+    ) -> List["Future[int]"]:
+        """
+        Inserts room data into the 'Rooms' table in chunked transactions
+        written by the storage worker.
+
+        Args:
+            rooms (Iterable[Tuple[int, str]]): An iterable of tuples, each containing an ID and a name of a room.
+            wait (bool): Whether to block until all rows are written.
+
+        Returns:
+            List[Future[int]]: One future per chunk, resolved with the number of rows written.
 
         Raises:
-            Error: If an error occurs while executing the SQL query.
+            Error: If wait is set and an error occurs while executing the SQL query.
         """
-        cursor = self.connection.cursor()
         try:
-            logger.info("Inserting room data...")
-            self.connection.execute("BEGIN TRANSACTION")
-            cursor.executemany("INSERT INTO Rooms (id, name) VALUES (?, ?)", rooms)
-            self.connection.commit()
-            logger.info("Successfully added %d room(s).", len(rooms))
+            logger.debug("Inserting room data...")
+            futures = self._enqueue_chunked("Rooms", _ROOMS_COLUMNS, rooms)
+            if wait:
+                count = sum(future.result() for future in futures)
+                logger.debug("Successfully added %d room(s).", count)
+            return futures
         except Error as e:
-            self.connection.rollback()
             logger.error("Error inserting room data: %s (%s)", e, type(e).__name__)
             raise
 
-    def insert_students(self, students: List[Tuple[int, str, str, str, int]]) -> None:
+    def insert_students(
+        self, students: Iterable[Tuple[int, str, str, str, int]], wait: bool = True
+    ) -> List["Future[int]"]:
         """
-        Inserts student data into the 'Students' table.
+        Inserts student data into the 'Students' table in chunked transactions
+        written by the storage worker. If a chunk fails, the transaction holding it (up to
+        _WRITE_BATCH_SIZE chunks of this call) is rolled back; the chunks committed before it,
+        and the rows of other calls, are kept.
 
         Args:
-            students (List[Tuple[int, str, str, str, int]]): A list of tuples, each containing
+            students (Iterable[Tuple[int, str, str, str, int]]): An iterable of tuples, each containing
             an ID, name, birthday, sex, and room number of a student.
+            wait (bool): Whether to block until all rows are written.
+
+        Returns:
+            List[Future[int]]: One future per chunk, resolved with the number of rows written.
 
         Raises:
-            Error: If an error occurs while executing the SQL query.
+            Error: If wait is set and an error occurs while executing the SQL query.
         """
-        cursor = self.connection.cursor()
         try:
-            logger.info("Inserting student data...")
-            self.connection.execute("BEGIN TRANSACTION")
-            cursor.executemany(
-                "INSERT INTO Students (id, name, birthday, sex, room) VALUES (?, ?, ?, ?, ?)",
-                students,
-            )
-            self.connection.commit()
-            logger.info("Successfully added %d student(s).", len(students))
+            logger.debug("Inserting student data...")
+            futures = self._enqueue_chunked("Students", _STUDENTS_COLUMNS, students)
+            if wait:
+                count = sum(future.result() for future in futures)
+                logger.debug("Successfully added %d student(s).", count)
+            return futures
         except Error as e:
-            self.connection.rollback()
             logger.error("Error inserting student data: %s (%s)", e, type(e).__name__)
             raise
 
+    def bulk_load(
+        self,
+        rooms: Iterable[Tuple[int, str]],
+        students: Iterable[Tuple[int, str, str, str, int]],
+    ) -> Tuple[int, int]:
+        """
+        Inserts the room and student data, creates the indexes, runs ANALYZE and rebuilds
+        'RoomSummary' in a single transaction on the calling thread, so the whole load is
+        committed (and synced) once.
+        The indexes are built after the rows are in place, which is cheaper than maintaining
+        them row by row. Foreign keys are not enforced per row; instead the students' room
+        references are verified once with PRAGMA foreign_key_check before the indexes are
+        built. If any step fails, nothing is committed.
+        Automatic WAL checkpoints are suspended for the load and restored afterwards; the
+        log is checkpointed once, with flush(), after the commit.
+
+        Args:
+            rooms (Iterable[Tuple[int, str]]): An iterable of tuples, each containing an ID and a name of a room.
+            students (Iterable[Tuple[int, str, str, str, int]]): An iterable of tuples, each containing
+            an ID, name, birthday, sex, and room number of a student.
+
+        Returns:
+            Tuple[int, int]: The number of rooms and students inserted.
+
+        Raises:
+            Error: If an error occurs while executing the SQL queries, or an IntegrityError
+            if a student references a room that does not exist.
+        """
+        with self._write_lock:
+            try:
+                logger.info("Bulk loading room and student data...")
+                self.connection.execute("PRAGMA wal_autocheckpoint=0")
+                with _transaction(self.connection):
+                    rooms_count = _multi_insert(
+                        self.connection, "Rooms", _ROOMS_COLUMNS, rooms
+                    )
+                    students_count = _multi_insert(
+                        self.connection, "Students", _STUDENTS_COLUMNS, students
+                    )
+                    violations = self.connection.execute(
+                        "PRAGMA foreign_key_check(Students)"
+                    ).fetchall()
+                    if violations:
+                        raise sqlite3.IntegrityError(
+                            f"{len(violations)} student(s) reference a missing room"
+                        )
+                    for statement in _INDEX_STATEMENTS + _REFRESH_ROOM_SUMMARY_STATEMENTS:
+                        self.connection.execute(statement)
+                self._summary_stale = False
+                logger.info(
+                    "Successfully loaded %d room(s) and %d student(s).",
+                    rooms_count,
+                    students_count,
+                )
+            except Error as e:
+                logger.error("Error bulk loading data: %s (%s)", e, type(e).__name__)
+                raise
+            finally:
+                self.connection.execute(
+                    f"PRAGMA wal_autocheckpoint={self._wal_autocheckpoint}"
+                )
+        self.flush()
+        return rooms_count, students_count
+
+    def flush(self) -> None:
+        """
+        Checkpoints the write-ahead log into the database file and truncates it.
+        Called once after a bulk load, which runs with automatic checkpoints suspended.
+
+        Raises:
+            Error: If an error occurs while executing the SQL query.
+        """
+        with self._write_lock:
+            try:
+                self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                logger.info("Write-ahead log checkpointed.")
+            except Error as e:
+                logger.error(
+                    "Error checkpointing the write-ahead log: %s (%s)",
+                    e,
+                    type(e).__name__,
+                )
+                raise
+
     def clear_tables(self) -> None:
         """
         Clears all data from the 'Rooms' and 'Students' tables without deleting the tables themselves.
-        Also drops the indexes created for these tables.
+        Also drops the indexes created for these tables and empties the derived 'RoomSummary' table
+        (creating it if it does not exist yet), so it matches the empty tables.
+        The indexes are dropped first, in the same transaction, so the unfiltered DELETEs
+        can use SQLite's truncate optimization instead of maintaining the indexes row by row.
+        All statements are submitted as a single script.
 
         Raises:
             Error: If an error occurs while executing the SQL queries.
         """
-        cursor = self.connection.cursor()
-        try:
-            logger.info(
-                "Clearing data from Rooms and Students tables and dropping indexes..."
-            )
-            self.connection.execute("BEGIN TRANSACTION")
-            cursor.execute("DELETE FROM Students")
-            cursor.execute("DELETE FROM Rooms")
-            cursor.execute("DROP INDEX IF EXISTS idx_students_room")
-            cursor.execute("DROP INDEX IF EXISTS idx_students_birthday")
-            self.connection.commit()
-            logger.info(
-                "Successfully cleared all data from the Rooms and Students tables and dropped indexes."
-            )
-        except Error as e:
-            self.connection.rollback()
-            logger.error(
-                "Error clearing tables and dropping indexes: %s (%s)", e, type(e).__name__
-            )
-            raise
+        with self._write_lock:
+            try:
+                logger.info(
+                    "Dropping indexes and clearing data from Rooms and Students tables..."
+                )
+                self.connection.executescript(_SQL_CLEAR_TABLES)
+                self._summary_stale = False
+                logger.info(
+                    "Successfully cleared all data from the Rooms and Students tables and dropped indexes."
+                )
+            except Error as e:
+                if self.connection.in_transaction:
+                    self.connection.rollback()
+                logger.error(
+                    "Error clearing tables and dropping indexes: %s (%s)",
+                    e,
+                    type(e).__name__,
+                )
+                raise
 
     def execute_query(self, query: str) -> None:
         """
         Executes the SQL-query passed as an argument in the database to which the connection is currently established.
+        The query runs in a BEGIN IMMEDIATE transaction, so the write lock is taken up-front.
 
         Raises:
             Error: If an error occurs while executing the SQL queries.
         """
-        cursor = self.connection.cursor()
-        try:
-            logger.info("Executing query: %s", query)
-            self.connection.execute("BEGIN TRANSACTION")
-            cursor.execute(query)
-            self.connection.commit()
-            logger.info("Successfully executed query: %s", query)
-        except Error as e:
-            self.connection.rollback()
-            logger.error("Error executing query: %s (%s)", e, type(e).__name__)
-            raise
+        with self._write_lock:
+            try:
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Executing query: %s", query)
+                with _transaction(self.connection):
+                    self.connection.execute(query)
+                    self._summary_stale = True
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Successfully executed query: %s", query)
+            except Error as e:
+                logger.error("Error executing query: %s (%s)", e, type(e).__name__)
+                raise
 
     def fetch_all(self, query: str) -> List[Tuple[Any, ...]]:
         """
@@ -173,51 +746,93 @@ class DbManager:
         Raises:
             Error: If an error occurs while executing the SQL query.
         """
-        cursor = self.connection.cursor()
         try:
-            logger.info("Fetching data with query: %s", query)
-            self.connection.execute("BEGIN TRANSACTION")
-            cursor.execute(query)
-            result = cursor.fetchall()
-            self.connection.commit()
-            logger.info("Successfully fetched data with query: %s", query)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Fetching data with query: %s", query)
+            with self._reader() as reader:
+                result = reader.execute(query).fetchall()
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Successfully fetched data with query: %s", query)
             return result
         except Error as e:
-            self.connection.rollback()
             logger.error("Error fetching data with query: %s (%s)", e, type(e).__name__)
             raise
 
     def create_indexes(self) -> None:
         """
-        Creates indexes for the 'room' and 'birthday' columns in the 'Students' table.
+        Creates composite indexes on the 'Students' table: (room, birthday_julian) lets the
+        per-room age aggregates read the stored Julian day of each birthday straight from
+        the index, and (room, sex)
+        lets the distinct sex count of task4 run as an index-only scan. Both also serve
+        lookups by room alone, so no separate single-column index is needed.
+        Statistics are refreshed with ANALYZE in the same transaction, so the planner never
+        sees the new indexes without statistics for them.
 
         Raises:
             Error: If an error occurs while executing the SQL query.
         """
-        cursor = self.connection.cursor()
-        try:
-            logger.info(
-                "Creating indexes for the 'room' and 'birthday' columns in the 'Students' table..."
-            )
-            self.connection.execute("BEGIN TRANSACTION")
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_students_room ON Students (room)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_students_birthday ON Students (birthday)"
-            )
-            self.connection.commit()
-            logger.info(
-                "Successfully created indexes for the 'room' and 'birthday' columns in the 'Students' table"
-            )
-        except Error as e:
-            self.connection.rollback()
-            logger.error("Error creating indexes: %s (%s)", e, type(e).__name__)
-            raise
+        with self._write_lock:
+            try:
+                logger.info(
+                    "Creating (room, birthday_julian) and (room, sex) indexes in the 'Students' table..."
+                )
+                self.connection.executescript(_SQL_CREATE_INDEXES)
+                logger.info(
+                    "Successfully created (room, birthday_julian) and (room, sex) indexes in the 'Students' table"
+                )
+            except Error as e:
+                if self.connection.in_transaction:
+                    self.connection.rollback()
+                logger.error("Error creating indexes: %s (%s)", e, type(e).__name__)
+                raise
+
+    def analyze(self) -> None:
+        """
+        Gathers table and index statistics (ANALYZE) for the query planner.
+        Should be run after bulk inserts so that task1 - task4 are planned on real data.
+
+        Raises:
+            Error: If an error occurs while executing the SQL query.
+        """
+        with self._write_lock:
+            try:
+                logger.info("Analyzing tables and indexes...")
+                self.connection.execute("ANALYZE")
+                logger.info("Successfully analyzed tables and indexes.")
+            except Error as e:
+                logger.error("Error analyzing tables: %s (%s)", e, type(e).__name__)
+                raise
+
+    def refresh_summary(self) -> None:
+        """
+        Rebuilds the 'RoomSummary' table: one row per room with its name, student count,
+        the average, earliest and latest birthday as Julian days (NULL for empty rooms) and
+        the number of distinct sexes. task1 - task4 read this table, scanning one row per room
+        instead of joining and grouping every student. They rebuild it first whenever the data
+        changed through this manager (bulk_load rebuilds it in its own transaction); call this
+        directly after changing the tables through another connection.
+
+        Raises:
+            Error: If an error occurs while executing the SQL queries.
+        """
+        with self._write_lock:
+            try:
+                logger.info("Refreshing the RoomSummary table...")
+                self.connection.executescript(_SQL_REFRESH_ROOM_SUMMARY)
+                self._summary_stale = False
+                logger.info("Successfully refreshed the RoomSummary table.")
+            except Error as e:
+                if self.connection.in_transaction:
+                    self.connection.rollback()
+                logger.error(
+                    "Error refreshing the RoomSummary table: %s (%s)", e, type(e).__name__
+                )
+                raise
 
     def task1(self) -> List[Tuple[str, int]]:
         """
-        Retrieves a list of rooms and the count of students in each room.
+        Retrieves a list of rooms and the count of students in each room,
+        as precomputed in 'RoomSummary' (see refresh_summary).
 
         Returns:
             List[Tuple[str, int]]: A list of tuples where each tuple contains the name of the room
@@ -226,25 +841,14 @@ class DbManager:
         Raises:
             Error: If an error occurs while executing the SQL query.
         """
-        cursor = self.connection.cursor()
+        self._ensure_summary()
         try:
             logger.info("Starting task1: Retrieving rooms and student counts...")
-            self.connection.execute("BEGIN TRANSACTION")
-            cursor.execute(
-                """
-                SELECT Rooms.name, COUNT(Students.id) AS students_count
-                FROM Rooms
-                LEFT JOIN Students ON Rooms.id = Students.room
-                GROUP BY Rooms.name
-                ORDER BY students_count DESC
-            """
-            )
-            result = cursor.fetchall()
-            self.connection.commit()
+            with self._reader() as reader:
+                result = reader.execute(_SQL_TASK1).fetchall()
             logger.info("Task1 completed successfully: Fetched %d records.", len(result))
             return result
         except Error as e:
-            self.connection.rollback()
             logger.error("Error executing task 1: %s (%s)", e, type(e).__name__)
             raise
 
@@ -252,8 +856,10 @@ class DbManager:
         """
         Retrieves the 5 rooms with the smallest average age of students.
         The age is calculated as the difference between the current date and
-        the student's birthday, converted into years. Results are ordered by ascending
-        average age. Rooms with a NULL average age are excluded.
+        the student's birthday, converted into years. The current date is evaluated
+        once per query and subtracted from the average birthday precomputed in
+        'RoomSummary' (see refresh_summary). Results are ordered by ascending
+        average age. Rooms without students are excluded.
 
         Returns:
             List[Tuple[str, float]]: A list of tuples where each tuple contains the room name
@@ -262,30 +868,16 @@ class DbManager:
         Raises:
             Error: If an error occurs while executing the SQL query.
         """
-        cursor = self.connection.cursor()
+        self._ensure_summary()
         try:
             logger.info(
                 "Starting task2: Retrieving rooms with the smallest average student age..."
             )
-            self.connection.execute("BEGIN TRANSACTION")
-            cursor.execute(
-                """
-                SELECT Rooms.name,
-                ROUND(AVG(JULIANDAY('now') - JULIANDAY(Students.birthday)) / 365.25, 3) AS avg_students_age
-                FROM Rooms
-                LEFT JOIN Students ON Rooms.id = Students.room
-                GROUP BY Rooms.name
-                HAVING avg_students_age IS NOT NULL
-                ORDER BY avg_students_age
-                LIMIT 5
-                """
-            )
-            result = cursor.fetchall()
-            self.connection.commit()
+            with self._reader() as reader:
+                result = reader.execute(_SQL_TASK2).fetchall()
             logger.info("Task2 completed successfully: Fetched %d records.", len(result))
             return result
         except Error as e:
-            self.connection.rollback()
             logger.error("Error executing task2: %s (%s)", e, type(e).__name__)
             raise
 
@@ -293,8 +885,9 @@ class DbManager:
         """
         Retrieves the 5 rooms with the largest difference in student ages.
         The age difference is calculated as the difference between the maximum and minimum
-        student ages in each room. The ages are determined based on the difference between
-        the current date and the students' birthdays, converted into years.
+        student ages in each room. Since the current date cancels out, it is computed as the
+        difference between the latest and earliest birthdays precomputed in 'RoomSummary'
+        (see refresh_summary), converted into years.
 
         Returns:
             List[Tuple[str, float]]: A list of tuples where each tuple contains the room name
@@ -303,30 +896,16 @@ class DbManager:
         Raises:
             Error: If an error occurs while executing the SQL query.
         """
-        cursor = self.connection.cursor()
+        self._ensure_summary()
         try:
             logger.info(
                 "Starting task3: Retrieving rooms with the largest difference in student ages..."
             )
-            self.connection.execute("BEGIN TRANSACTION")
-            cursor.execute(
-                """
-                SELECT Rooms.name,
-                ROUND((MAX(JULIANDAY('now') - JULIANDAY(Students.birthday)) / 365.25 -
-                MIN(JULIANDAY('now') - JULIANDAY(Students.birthday)) / 365.25), 3) AS age_difference
-                FROM Rooms
-                JOIN Students ON Rooms.id = Students.room
-                GROUP BY Rooms.name
-                ORDER BY age_difference DESC
-                LIMIT 5
-                """
-            )
-            result = cursor.fetchall()
-            self.connection.commit()
+            with self._reader() as reader:
+                result = reader.execute(_SQL_TASK3).fetchall()
             logger.info("Task3 completed successfully: Fetched %d records.", len(result))
             return result
         except Error as e:
-            self.connection.rollback()
             logger.error("Error executing task3: %s (%s)", e, type(e).__name__)
             raise
 
@@ -334,8 +913,8 @@ class DbManager:
         """
         Retrieves the names of rooms where students of different sexes reside.
         This method identifies rooms where there are students of at least two distinct sexes.
-        It does this by joining the 'Rooms' and 'Students' tables, grouping the results by room name,
-        and filtering for rooms with more than one distinct sex among students.
+        It does this by filtering the per-room distinct sex counts precomputed in 'RoomSummary'
+        (see refresh_summary) for rooms with more than one distinct sex among students.
 
         Returns:
             List[Tuple[str]]: A list of tuples where each contains room name where students of different sexes reside.
@@ -343,26 +922,52 @@ class DbManager:
         Raises:
             Error: If an error occurs while executing the SQL query.
         """
-        cursor = self.connection.cursor()
+        self._ensure_summary()
         try:
             logger.info(
                 "Starting task4: Retrieving rooms with students of different sexes..."
             )
-            self.connection.execute("BEGIN TRANSACTION")
-            cursor.execute(
-                """
-                SELECT Rooms.name
-                FROM Rooms
-                LEFT JOIN Students ON Rooms.id = Students.room
-                GROUP BY Rooms.name
-                HAVING COUNT(DISTINCT Students.sex) > 1
-                """
-            )
-            result = cursor.fetchall()
-            self.connection.commit()
+            with self._reader() as reader:
+                result = reader.execute(_SQL_TASK4).fetchall()
             logger.info("Task4 completed successfully: Fetched %d records.", len(result))
             return result
         except Error as e:
-            self.connection.rollback()
             logger.error("Error executing task4: %s (%s)", e, type(e).__name__)
             raise
+
+    def run_all_tasks(
+        self,
+    ) -> Tuple[
+        List[Tuple[str, int]],
+        List[Tuple[str, float]],
+        List[Tuple[str, float]],
+        List[Tuple[str]],
+    ]:
+        """
+        Computes the results of task1 - task4 with a single query over 'RoomSummary'.
+        The four results are sorted, limited and filtered in the database and returned
+        as one UNION ALL result set, with each row tagged by its task number and position;
+        the rows are then only split by tag in Python.
+
+        Returns:
+            Tuple[List[Tuple[str, int]], List[Tuple[str, float]], List[Tuple[str, float]], List[Tuple[str]]]:
+            The results of task1, task2, task3 and task4, in the same shape as the
+            individual task methods return them.
+
+        Raises:
+            Error: If an error occurs while executing the SQL query.
+        """
+        self._ensure_summary()
+        try:
+            logger.info("Starting all tasks: Retrieving per-room aggregates...")
+            with self._reader() as reader:
+                rows = reader.execute(_SQL_ALL_TASKS).fetchall()
+        except Error as e:
+            logger.error("Error executing all tasks: %s (%s)", e, type(e).__name__)
+            raise
+        results = ([], [], [], [])
+        for task, name, value, _ in rows:
+            results[task - 1].append((name,) if task == 4 else (name, value))
+        task1, task2, task3, task4 = results
+        logger.info("All tasks completed successfully: Fetched %d record(s).", len(rows))
+        return task1, task2, task3, task4
@@ -2,93 +2,117 @@
 json_parser Module
 
 This module provides functions to read and parse JSON files containing data about rooms and students.
-It includes functions for reading room and student data from JSON files and returning them as lists of tuples.
+It includes functions for reading room and student data from JSON files and returning them as lazy iterators of tuples.
+The fields are stored column by column (integer columns as array('q') when every value fits, as a plain list otherwise)
+once the file is decoded, and the row tuples are only built, by zip, as the database manager consumes them.
+The files are decoded with orjson when it is installed, falling back to the standard json module.
 Logging is configured to track the parsing process and handle errors.
 
 Functions:
-- read_rooms_file(file_path: str) -> Optional[List[Tuple[int, str]]]:
-    Parses a JSON file containing room data and returns a list of tuples with room IDs and names.
+- read_rooms_file(file_path: str) -> Optional[Iterator[Tuple[int, str]]]:
+    Parses a JSON file containing room data and returns an iterator of tuples with room IDs and names.
 
-- read_students_file(file_path: str) -> Optional[List[Tuple[int, str, str, str, int]]]:
-    Parses a JSON file containing student data and returns a list of tuples with student details.
+- read_students_file(file_path: str) -> Optional[Iterator[Tuple[int, str, str, str, int]]]:
+    Parses a JSON file containing student data and returns an iterator of tuples with student details.
 """
 
-import json
 import logging
-from typing import List, Optional, Tuple
+from array import array
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from log_settings import env_log_level
+
+
+try:
+    from orjson import loads
+except ImportError:  # orjson is optional, the standard library parser is the fallback
+    from json import loads
 
 
 logger = logging.getLogger("json_parser_logger")
-logger.setLevel(logging.INFO)
-handler = logging.FileHandler("logs/json_parser.log")
-handler.setLevel(logging.INFO)
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-handler.setFormatter(formatter)
+logger.setLevel(env_log_level())
 
-if not logger.hasHandlers():
+if not logger.handlers:
+    handler = logging.FileHandler("logs/json_parser.log", delay=True)
+    handler.setLevel(logging.DEBUG)
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    handler.setFormatter(formatter)
     logger.addHandler(handler)
 
 logger.propagate = False
 
 
-def read_rooms_file(file_path: str) -> Optional[List[Tuple[int, str]]]:
+def _int_column(data: List[Dict[str, Any]], key: str) -> Union[array, List[Any]]:
+    """
+    Collects the key field of every record into an array('q'). Values that do not fit it
+    (numeric strings, null, integers beyond 64 bits) are passed through unchanged in a list
+    instead, so the database decides how to store them, as it did before the columns
+    were packed.
+    """
+    getter = itemgetter(key)
+    try:
+        return array("q", map(getter, data))
+    except (TypeError, OverflowError):
+        return list(map(getter, data))
+
+
+def read_rooms_file(file_path: str) -> Optional[Iterator[Tuple[int, str]]]:
     """
-    Parses a JSON file and returns a list of tuples.
+    Parses a JSON file and returns an iterator of tuples.
 
     Args:
         file_path (str): The path to the JSON file.
 
     Returns:
-        Optional[List[Tuple[int, str]]]: A list of tuples where each tuple contains
-                                         an ID and a name from the JSON file,
-                                         or None if the file is empty.
+        Optional[Iterator[Tuple[int, str]]]: An iterator of tuples where each tuple contains
+                                             an ID and a name from the JSON file,
+                                             or None if the file is empty.
     """
     logger.info("Reading rooms data from file: %s", file_path)
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            data = json.load(file)
+        with open(file_path, "rb") as file:
+            data = loads(file.read())
         if not data:  # If the JSON file is empty
             logger.warning("Rooms file is empty.")
             return None
-        rooms = [(item["id"], item["name"]) for item in data]
-        logger.info("Successfully parsed %d rooms from file.", len(rooms))
-        return rooms
+        ids = _int_column(data, "id")
+        names = list(map(itemgetter("name"), data))
+        logger.info("Successfully parsed %d rooms from file.", len(ids))
+        return zip(ids, names)
     except Exception as e:
         logger.error("Error reading rooms file: %s (%s)", e, type(e).__name__)
         raise
 
 
-def read_students_file(file_path: str) -> Optional[List[Tuple[int, str, str, str, int]]]:
+def read_students_file(
+    file_path: str,
+) -> Optional[Iterator[Tuple[int, str, str, str, int]]]:
     """
-    Parses a JSON file and returns a list of tuples.
+    Parses a JSON file and returns an iterator of tuples.
 
     Args:
         file_path (str): The path to the JSON file.
 
     Returns:
-        Optional[List[Tuple[int, str, str, str, int]]]: A list of tuples where each tuple contains
-                                                        an ID, name, birthday, sex, and room number
-                                                        from the JSON file, or None if the file is empty.
+        Optional[Iterator[Tuple[int, str, str, str, int]]]: An iterator of tuples where each tuple contains
+                                                            an ID, name, birthday, sex, and room number
+                                                            from the JSON file, or None if the file is empty.
     """
     logger.info("Reading students data from file: %s", file_path)
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            data = json.load(file)
+        with open(file_path, "rb") as file:
+            data = loads(file.read())
         if not data:  # If the JSON file is empty
             logger.warning("Students file is empty.")
             return None
-        students = [
-            (
-                item["id"],
-                item["name"],
-                item["birthday"],
-                item["sex"],
-                item["room"],
-            )
-            for item in data
-        ]
-        logger.info("Successfully parsed %d students from file.", len(students))
-        return students
+        ids = _int_column(data, "id")
+        names = list(map(itemgetter("name"), data))
+        birthdays = list(map(itemgetter("birthday"), data))
+        sexes = list(map(itemgetter("sex"), data))
+        rooms = _int_column(data, "room")
+        logger.info("Successfully parsed %d students from file.", len(ids))
+        return zip(ids, names, birthdays, sexes, rooms)
     except Exception as e:
         logger.error("Error reading students file: %s (%s)", e, type(e).__name__)
         raise
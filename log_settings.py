@@ -0,0 +1,32 @@
+"""
+log_settings Module
+
+This module provides the logging settings shared by the other modules of the script.
+
+Functions:
+- env_log_level(default: int = logging.WARNING) -> int:
+    Returns the logging level named by the LOG_LEVEL environment variable, or default if it is unset or unknown.
+"""
+
+import logging
+import os
+
+
+def env_log_level(default: int = logging.WARNING) -> int:
+    """
+    Reads the logging level from the LOG_LEVEL environment variable. Level names are
+    case-insensitive (e.g. "info", "DEBUG") and numeric levels (e.g. "10") are accepted.
+    Any other value falls back to default instead of failing, so a mistyped variable
+    cannot stop the script before it starts.
+
+    Args:
+        default (int): The level to use if LOG_LEVEL is unset or not a known level.
+
+    Returns:
+        int: The logging level.
+    """
+    value = os.environ.get("LOG_LEVEL", "").strip()
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value.upper())
+    return level if isinstance(level, int) else default
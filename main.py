@@ -4,6 +4,7 @@ import logging
 from db_manager import DbManager
 from json_parser import read_rooms_file, read_students_file
 from runtime_handler import (
+    FileReadError,
     handle_db_operation,
     handle_file_reading,
     handle_output_operation,
@@ -12,14 +13,16 @@ from runtime_handler import (
 
 logger = logging.getLogger("main_logger")
 logger.setLevel(logging.INFO)
-handler = logging.FileHandler("logs/main.log")
-handler.setLevel(logging.INFO)
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-handler.setFormatter(formatter)
 
-if not logger.hasHandlers():
+if not logger.handlers:
+    handler = logging.FileHandler("logs/main.log", delay=True)
+    handler.setLevel(logging.INFO)
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    handler.setFormatter(formatter)
     logger.addHandler(handler)
 
+logger.propagate = False
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -47,62 +50,58 @@ def main():
     args = parser.parse_args()
 
     logger.info("Reading input files...")
-    rooms = handle_file_reading(
-        read_rooms_file, args.rooms, "Failed to read rooms file", logger
-    )
-    students = handle_file_reading(
-        read_students_file, args.students, "Failed to read students file", logger
-    )
+    try:
+        rooms = handle_file_reading(
+            read_rooms_file, args.rooms, "Failed to read rooms file", logger
+        )
+        students = handle_file_reading(
+            read_students_file, args.students, "Failed to read students file", logger
+        )
+    except FileReadError:
+        return
 
     if rooms is None:
         logger.error("Rooms file is empty.")
         print("Rooms file is empty.")
         return
-    elif rooms == -1:
-        return
     elif students is None:
         logger.error("Students file is empty.")
         print("Students file is empty.")
         return
-    elif students == -1:
-        return
 
     logger.info("Successfully read input files.")
 
-    db = DbManager()
-
-    logger.info("Сlearing the Rooms and Students tables in database")
-    if not handle_db_operation(db.clear_tables, "Failed to clear the database", logger):
-        return
-
-    logger.info("Inserting rooms data...")
-    if not handle_db_operation(db.insert_rooms, "Failed to insert rooms", logger, rooms):
-        return
-
-    logger.info("Inserting students data...")
-    if not handle_db_operation(
-        db.insert_students, "Failed to insert students", logger, students
-    ):
-        return
-
-    logger.info("Creating indexes...")
-    if not handle_db_operation(db.create_indexes, "Failed to create indexes", logger):
-        return
-
-    try:
-        logger.info("Performing tasks ...")
-        task_results = [db.task1(), db.task2(), db.task3(), db.task4()]
-    except Exception:
-        logger.error("Failed to perform tasks.")
-        print("Failed to perform tasks. Look logs/db_manager.log for details.")
-        return
-
-    if not handle_output_operation(args.format, task_results, logger):
-        return
-
-    logger.info("Сlearing the Rooms and Students tables in database")
-    if not handle_db_operation(db.clear_tables, "Failed to clear the database", logger):
-        return
+    with DbManager() as db:
+        logger.info("Сlearing the Rooms and Students tables in database")
+        if not handle_db_operation(
+            db.clear_tables, "Failed to clear the database", logger
+        ):
+            return
+
+        logger.info(
+            "Loading rooms and students data, creating indexes and the room summary..."
+        )
+        if not handle_db_operation(
+            db.bulk_load, "Failed to load rooms and students", logger, rooms, students
+        ):
+            return
+
+        try:
+            logger.info("Performing tasks ...")
+            task_results = db.run_all_tasks()
+        except Exception:
+            logger.error("Failed to perform tasks.")
+            print("Failed to perform tasks. Look logs/db_manager.log for details.")
+            return
+
+        if not handle_output_operation(args.format, task_results, logger):
+            return
+
+        logger.info("Сlearing the Rooms and Students tables in database")
+        if not handle_db_operation(
+            db.clear_tables, "Failed to clear the database", logger
+        ):
+            return
 
 
 if __name__ == "__main__":
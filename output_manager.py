@@ -6,47 +6,132 @@ It includes functions for converting lists of tuples into JSON and XML files and
 Logging is configured to track the conversion process and handle errors, including cases where the input data is empty.
 
 Functions:
-- output_json(data: List[Tuple[Any, ...]], task_number: str) -> Optional[str]:
-    Converts data to JSON format, writes it to a file, and returns the absolute file path.
+- output_json(data: List[Tuple[Any, ...]], task_number: str, cwd: Optional[str] = None, stream: Optional[BinaryIO] = None, pretty: bool = False, non_ascii: bool = False) -> Optional[str]:
+    Converts data to JSON format, writes it to a file (or the given stream), and returns the absolute file path.
     If the data is empty, a warning is logged, and no file is created.
 
-- output_xml(data: List[Tuple[Any, ...]], task_number: str) -> Optional[str]:
-    Converts data to XML format, writes it to a file, and returns the absolute file path.
+- output_xml(data: List[Tuple[Any, ...]], task_number: str, cwd: Optional[str] = None, stream: Optional[BinaryIO] = None) -> Optional[str]:
+    Converts data to XML format, writes it to a file (or the given stream), and returns the absolute file path.
     If the data is empty, a warning is logged, and no file is created.
 """
 
 import json
 import logging
 import os
-import xml.etree.ElementTree as ET
-from typing import Any, List, Optional, Tuple
-from xml.dom import minidom
+from contextlib import contextmanager, suppress
+from typing import Any, BinaryIO, Iterator, List, Optional, Tuple
 
 
+try:
+    from lxml import etree as ET
+
+    _XML_ACCELERATED = True
+except ImportError:  # lxml is optional, the standard library ElementTree is the fallback
+    import xml.etree.ElementTree as ET
+
+    try:
+        import _elementtree
+
+        _XML_ACCELERATED = ET.Element is _elementtree.Element
+    except ImportError:
+        _XML_ACCELERATED = False
+
+
+try:
+    import orjson
+
+    # orjson always writes non-ASCII characters as UTF-8, so non_ascii makes no difference.
+    def _dumps(data: Any, pretty: bool, non_ascii: bool) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+
+except ImportError:  # orjson is optional, the standard library encoder is the fallback
+
+    # Unless the caller flags non-ASCII data, the default ensure_ascii=True lets the C
+    # encoder escape any such characters itself, so its result is plain ASCII and needs
+    # no UTF-8 encoding pass.
+    def _dumps(data: Any, pretty: bool, non_ascii: bool) -> bytes:
+        layout = {"indent": 2} if pretty else {"separators": (",", ":")}
+        if non_ascii:
+            return json.dumps(data, ensure_ascii=False, **layout).encode("utf-8")
+        return json.dumps(data, **layout).encode("ascii")
+
+
+_JSON_BLOCK_ROWS = 1024
+
+# Output files are written through a 1 MiB buffer instead of the default 8 KiB one,
+# so a large result takes a handful of write() calls.
+_WRITE_BUFFER_SIZE = 1 << 20
+
 logger = logging.getLogger("output_manager_logger")
 logger.setLevel(logging.INFO)
-handler = logging.FileHandler("logs/output_manager.log")
-handler.setLevel(logging.INFO)
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-handler.setFormatter(formatter)
 
-if not logger.hasHandlers():
+if not logger.handlers:
+    handler = logging.FileHandler("logs/output_manager.log", delay=True)
+    handler.setLevel(logging.INFO)
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    handler.setFormatter(formatter)
     logger.addHandler(handler)
 
 logger.propagate = False
 
+if not _XML_ACCELERATED:
+    logger.warning(
+        "Neither lxml nor the ElementTree C accelerator is available; XML output will be slow."
+    )
+
 
-def output_json(data: List[Tuple[Any, ...]], task_number: str) -> Optional[str]:
+@contextmanager
+def _open_output(file_path: str, stream: Optional[BinaryIO]) -> Iterator[BinaryIO]:
     """
-    Converts the tasks data into a JSON-formatted string, writes it to a file,
-    and returns the absolute file path.
+    Yields the binary file to write the output to: stream itself (left open) if one is given,
+    otherwise a temporary file next to file_path that replaces it only once the block has
+    completed. If writing fails, the temporary file is removed and an existing file_path is
+    left untouched.
+    """
+    if stream is not None:
+        yield stream
+        return
+    temp_path = f"{file_path}.tmp"
+    try:
+        with open(temp_path, "wb", buffering=_WRITE_BUFFER_SIZE) as file:
+            yield file
+        os.replace(temp_path, file_path)
+    except BaseException:
+        with suppress(OSError):
+            os.remove(temp_path)
+        raise
+
+
+def output_json(
+    data: List[Tuple[Any, ...]],
+    task_number: str,
+    cwd: Optional[str] = None,
+    stream: Optional[BinaryIO] = None,
+    pretty: bool = False,
+    non_ascii: bool = False,
+) -> Optional[str]:
+    """
+    Converts the tasks data into JSON (compact, or indented by two spaces if pretty is set;
+    UTF-8 encoded), writes it to a file, and returns the absolute file path. The data is encoded with orjson when it
+    is installed, and with the standard json module otherwise. Both write ASCII data identically, and write
+    non-ASCII characters as raw UTF-8 when non_ascii is set. Without it, the standard json module escapes them
+    as \\uXXXX while orjson still writes UTF-8; both forms decode to the same values.
+    The file is written in blocks of _JSON_BLOCK_ROWS rows, so memory use does not grow with
+    the size of the output.
 
     Args:
         data (List[Tuple[Any, ...]]): The data to be converted to JSON format.
         task_number (str): The task number that provides the data.
+        cwd (Optional[str]): The current working directory, used to build the absolute path;
+                             looked up if not given.
+        stream (Optional[BinaryIO]): A binary file-like object to write to instead of the file.
+        pretty (bool): Whether to indent the JSON for human readers.
+        non_ascii (bool): Whether the data may contain non-ASCII text that should be written as UTF-8
+                          rather than escaped.
 
     Returns:
-        Optional[str]: The absolute path to the written JSON file, or None if the data is empty.
+        Optional[str]: The absolute path to the written JSON file, or None if the data is empty
+                       or was written to stream.
     """
     logger.info("Converting the %s data to JSON...", task_number)
     if not data:
@@ -55,59 +140,79 @@ def output_json(data: List[Tuple[Any, ...]], task_number: str) -> Optional[str]:
         )
         return None
     try:
-        json_data = json.dumps(data, indent=4, ensure_ascii=False)
         file_path = f"{task_number}_output.json"
-        with open(file_path, "w", encoding="utf-8") as file:
-            file.write(json_data)
+        with _open_output(file_path, stream) as file:
+            # The rows are encoded in blocks; each block is a list whose brackets (and,
+            # when indented, the newlines next to them) are cut off, so the blocks splice
+            # into one list and the whole document never exists as a single string.
+            if pretty:
+                opening, separator, closing, trim = b"[\n", b",\n", b"\n]", 2
+            else:
+                opening, separator, closing, trim = b"[", b",", b"]", 1
+            file.write(opening)
+            for start in range(0, len(data), _JSON_BLOCK_ROWS):
+                end = start + _JSON_BLOCK_ROWS
+                if start:
+                    file.write(separator)
+                file.write(_dumps(data[start:end], pretty, non_ascii)[trim:-trim])
+            file.write(closing)
         logger.info("Successfully converted the %s data to JSON.", task_number)
-        return os.path.abspath(file_path)
-    except (OSError, IOError) as e:
+        if stream is not None:
+            return None
+        return os.path.join(os.getcwd() if cwd is None else cwd, file_path)
+    except OSError as e:
         logger.error("Error writing the %s data JSON to file: %s", task_number, e)
         raise
-    except json.JSONDecodeError as e:
+    except TypeError as e:
         logger.error("Error serializing the %s data to JSON: %s", task_number, e)
         raise
 
 
-def output_xml(data: List[Tuple[Any, ...]], task_number: str) -> Optional[str]:
+def output_xml(
+    data: List[Tuple[Any, ...]],
+    task_number: str,
+    cwd: Optional[str] = None,
+    stream: Optional[BinaryIO] = None,
+) -> Optional[str]:
     """
     Converts the tasks data into XML-formatted string, writes it to a file,
-    and returns the absolute file path.
+    and returns the absolute file path. The tree is indented in place and serialized in
+    a single pass, by libxml2 when lxml is installed and by ElementTree otherwise.
 
     Args:
         data (List[Tuple[Any, ...]]): The data to be converted to XML format.
         task_number (str): The task number that provides the data.
+        cwd (Optional[str]): The current working directory, used to build the absolute path;
+                             looked up if not given.
+        stream (Optional[BinaryIO]): A binary file-like object to write to instead of the file.
 
     Returns:
-        Optional[str]: The absolute path to the written XML file, or None if the data is empty.
+        Optional[str]: The absolute path to the written XML file, or None if the data is empty
+                       or was written to stream.
     """
     logger.info("Converting the %s data to XML...", task_number)
     if not data:
         logger.warning("The %s data is empty. XML file will not be created.", task_number)
         return None
 
-    def tuple_to_xml(tag, tpl):
-        elem = ET.Element(tag)
-        for i, value in enumerate(tpl):
-            child = ET.SubElement(elem, f"item_{i}")
-            child.text = str(value)
-        return elem
-
     try:
         root = ET.Element("root")
+        tags = [f"item_{i}" for i in range(max(map(len, data)))]
         for item in data:
-            root.append(tuple_to_xml("data", item))
-        xml_str = ET.tostring(root, encoding="utf-8")
-        parsed_xml = minidom.parseString(xml_str)
-        pretty_xml_str = parsed_xml.toprettyxml(indent="    ")
+            data_elem = ET.SubElement(root, "data")
+            for tag, value in zip(tags, item):
+                ET.SubElement(data_elem, tag).text = str(value)
         file_path = f"{task_number}_output.xml"
-        with open(file_path, "w", encoding="utf-8") as file:
-            file.write(pretty_xml_str)
+        ET.indent(root, space="    ")
+        with _open_output(file_path, stream) as file:
+            ET.ElementTree(root).write(file, xml_declaration=True, encoding="UTF-8")
         logger.info("Successfully converted the %s data to XML.", task_number)
-        return os.path.abspath(file_path)
-    except (OSError, IOError) as e:
+        if stream is not None:
+            return None
+        return os.path.join(os.getcwd() if cwd is None else cwd, file_path)
+    except OSError as e:
         logger.error("Error writing the %s data XML to file: %s", task_number, e)
         raise
-    except Exception as e:
-        logger.error("Error writing the %s data XML to file: %s", task_number, e)
+    except (TypeError, ValueError) as e:
+        logger.error("Error serializing the %s data to XML: %s", task_number, e)
         raise
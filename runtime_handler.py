@@ -5,65 +5,86 @@ This module provides functions for handling various runtime operations including
 It includes functions to manage file reading with error handling, perform database operations with logging, and write output results to files in either JSON or XML format.
 Logging is configured to track the operations and handle errors, including cases where operations fail or input data is empty.
 
+Exceptions:
+- FileReadError:
+    Raised by handle_file_reading when an input file cannot be read.
+
 Functions:
-- handle_file_reading(func: Callable[[str], List[Tuple[int, str]] | List[Tuple[int, str, str, str, int]] | None], file_path: str, log_error_message: str, logger: Logger) -> int | List[Tuple[int, str]] | List[Tuple[int, str, str, str, int]] | None:
+- handle_file_reading(func: Callable[[str], ParsedRows], file_path: str, log_error_message: str, logger: Logger) -> ParsedRows:
     Reads data from a file using a specified function and handles errors. Logs an error message and prints it if reading fails.
-    Returns the result from the function or -1 if an error occurs.
+    Returns the result from the function or raises FileReadError if an error occurs.
 
-- handle_db_operation(operation: Callable[..., None], error_message: str, logger: Logger, *args) -> bool:
+- handle_db_operation(operation: Callable[..., Any], error_message: str, logger: Logger, *args: Any) -> bool:
     Executes a database operation and handles errors. Logs success or error messages and prints the error if the operation fails.
     Returns True if the operation is successful, or False if an error occurs.
 
-- handle_output_operation(output_format: str, task_results: List, logger: Logger) -> bool:
-    Writes the task results to a file in the specified format (JSON or XML). Handles errors during the writing process, logs them, and prints messages if any task data is empty or writing fails.
+- handle_output_operation(output_format: str, task_results: Sequence[List[Tuple[Any, ...]]], logger: Logger) -> bool:
+    Writes the task results to files in the specified format (JSON or XML) concurrently. Handles errors during the writing process, logs them, and prints messages if any task data is empty or writing fails.
     Returns True if all output operations are successful, or False if an error occurs.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from logging import Logger
-from typing import Callable, List, Tuple, Union
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple, Union
 
 from output_manager import output_json, output_xml
 
 
+RoomRow = Tuple[int, str]
+StudentRow = Tuple[int, str, str, str, int]
+# What the json_parser readers return: an iterator of rows, or None for an empty file.
+ParsedRows = Optional[Union[Iterator[RoomRow], Iterator[StudentRow]]]
+OutputFunc = Callable[[List[Tuple[Any, ...]], str, Optional[str]], Optional[str]]
+
+
+class FileReadError(Exception):
+    """
+    Raised when an input file cannot be read. The failure has already been logged
+    and reported to the user by the time it is raised.
+    """
+
+
 def handle_file_reading(
-    func: Callable[
-        [str], Union[List[Tuple[int, str]], List[Tuple[int, str, str, str, int]], None]
-    ],
+    func: Callable[[str], ParsedRows],
     file_path: str,
     log_error_message: str,
     logger: Logger,
-) -> Union[int, List[Tuple[int, str]], List[Tuple[int, str, str, str, int]], None]:
+) -> ParsedRows:
     """
     Reads data from a file using a specified function and handles errors.
 
     Args:
-        func (Callable[[str], Union[List[Tuple[int, str]], List[Tuple[int, str, str, str, int]], None]]): The function used to read data from the file.
+        func (Callable[[str], ParsedRows]): The function used to read data from the file.
         file_path (str): The path to the file to be read.
         log_error_message (str): The error message to log if reading the file fails.
         logger (Logger): The logger instance to use for logging errors.
 
     Returns:
-        Union[int, List[Tuple[int, str]], List[Tuple[int, str, str, str, int]], None]: The data read from the file, -1 if an error occurs, or None if the file is empty.
+        ParsedRows: The rows read from the file, or None if the file is empty.
+
+    Raises:
+        FileReadError: If reading the file fails.
     """
     try:
         return func(file_path)
     except Exception:
         logger.error(log_error_message)
         print(f"{log_error_message}. Look logs/json_parser.log for details.")
-        return -1
+        raise FileReadError(log_error_message) from None
 
 
 def handle_db_operation(
-    operation: Callable[..., None], error_message: str, logger: Logger, *args
+    operation: Callable[..., Any], error_message: str, logger: Logger, *args: Any
 ) -> bool:
     """
     Executes a database operation and handles errors.
 
     Args:
-        operation (Callable[..., None]): The database operation to perform.
+        operation (Callable[..., Any]): The database operation to perform; its return value is ignored.
         error_message (str): The error message to log if the operation fails.
         logger (Logger): The logger instance to use for logging errors.
-        *args: Arguments to pass to the database operation.
+        *args (Any): Arguments to pass to the database operation.
 
     Returns:
         bool: True if the operation is successful, False if an error occurs.
@@ -78,36 +99,47 @@ def handle_db_operation(
 
 
 def handle_output_operation(
-    output_format: str, task_results: List, logger: Logger
+    output_format: str, task_results: Sequence[List[Tuple[Any, ...]]], logger: Logger
 ) -> bool:
     """
     Writes the task results to a file in the specified format (JSON or XML).
+    The files are independent, so they are written concurrently by a thread pool;
+    the outcome of each task is then reported in task order.
 
     Args:
         output_format (str): The format for the output files, either "json" or "xml".
-        task_results (List): The results of tasks to be written to files.
+        task_results (Sequence[List[Tuple[Any, ...]]]): The results of tasks to be written to files.
         logger (Logger): The logger instance to use for logging information and errors.
 
     Returns:
         bool: True if all output operations are successful, False if an error occurs.
     """
-    output_func = output_xml if output_format == "xml" else output_json
-    for index, result in enumerate(task_results):
-        try:
-            logger.info(
-                f"Writing results for task {index + 1} to {output_format.upper()} file..."
-            )
-            task_result = output_func(result, f"task{index + 1}")
-            if task_result is None:
+    output_func: OutputFunc = output_xml if output_format == "xml" else output_json
+    fmt_upper = output_format.upper()
+    logger.info(
+        "Writing results for %d task(s) to %s files...",
+        len(task_results),
+        fmt_upper,
+    )
+    cwd = os.getcwd()
+    with ThreadPoolExecutor(max_workers=max(1, len(task_results))) as executor:
+        futures = [
+            executor.submit(output_func, result, f"task{index + 1}", cwd)
+            for index, result in enumerate(task_results)
+        ]
+        for index, future in enumerate(futures):
+            try:
+                task_result = future.result()
+                if task_result is None:
+                    print(
+                        f"Task {index + 1} data is empty. Output file for this task will not be created."
+                    )
+                else:
+                    print(f"Task {index + 1} output file path: {task_result}.")
+            except Exception:
+                logger.error("Failed to write results to %s file.", fmt_upper)
                 print(
-                    f"Task {index + 1} data is empty. Output file for this task will not be created."
+                    f"Failed to write results to {fmt_upper} file. Look logs/output_manager.log for details."
                 )
-            else:
-                print(f"Task {index + 1} output file path: {task_result}.")
-        except Exception:
-            logger.error(f"Failed to write results to {output_format.upper()} file.")
-            print(
-                f"Failed to write results to {output_format.upper()} file. Look logs/output_manager.log for details."
-            )
-            return False
+                return False
     return True
@@ -1,5 +1,9 @@
+import os
+import sqlite3
+import tempfile
 import unittest
-from sqlite3 import Error
+from sqlite3 import SQLITE_LIMIT_VARIABLE_NUMBER, Error, IntegrityError
+from unittest.mock import patch
 
 from db_manager import DbManager
 
@@ -14,13 +18,14 @@ class TestDbManager(unittest.TestCase):
 
     def setUp(self):
         self.insert_test_data()
+        self.db_manager.refresh_summary()
 
     def tearDown(self):
         self.db_manager.clear_tables()
 
     @classmethod
     def tearDownClass(cls):
-        cls.db_manager = None
+        cls.db_manager.close()
 
     def insert_test_data(self):
         self.db_manager.execute_query("INSERT INTO Rooms (id, name) VALUES (1, 'Room A')")
@@ -65,6 +70,45 @@ class TestDbManager(unittest.TestCase):
         expected = [("Room A",), ("Room B",)]
         self.assertEqual(result, expected)
 
+    def test_run_all_tasks(self):
+        task1, task2, task3, task4 = self.db_manager.run_all_tasks()
+        self.assertEqual(task1, self.db_manager.task1())
+        for (room_res, value_res), (room_exp, value_exp) in zip(
+            task2, self.db_manager.task2()
+        ):
+            self.assertEqual(room_res, room_exp)
+            self.assertAlmostEqual(value_res, value_exp, places=2)
+        self.assertEqual(task3, self.db_manager.task3())
+        self.assertEqual(task4, self.db_manager.task4())
+
+    def test_refresh_summary(self):
+        self.db_manager.insert_rooms([(4, "Room D")])
+        self.db_manager.refresh_summary()
+        result = self.db_manager.fetch_all(
+            "SELECT room_id, name, students_count, distinct_sex FROM RoomSummary ORDER BY room_id"
+        )
+        self.assertEqual(
+            result,
+            [
+                (1, "Room A", 2, 2),
+                (2, "Room B", 2, 2),
+                (3, "Room C", 1, 1),
+                (4, "Room D", 0, 0),
+            ],
+        )
+
+    def test_tasks_see_new_rows_without_refresh(self):
+        self.db_manager.insert_rooms([(4, "Room D")])
+        self.db_manager.insert_students(
+            [(6, "Frank", "1998-06-06T00:00:00.000000", "M", 4)]
+        )
+        self.assertIn(("Room D", 1), self.db_manager.task1())
+
+    def test_tasks_after_clear_tables(self):
+        self.db_manager.clear_tables()
+        self.assertEqual(self.db_manager.task1(), [])
+        self.assertEqual(self.db_manager.run_all_tasks(), ([], [], [], []))
+
     def test_insert_rooms(self):
         self.db_manager.clear_tables()
         rooms = [(4, "Room D"), (5, "Room E")]
@@ -82,19 +126,78 @@ class TestDbManager(unittest.TestCase):
             (7, "Grace", "2000-07-07T00:00:00.000000", "F", 1),
         ]
         self.db_manager.insert_students(students)
-        result = self.db_manager.fetch_all("SELECT * FROM Students")
+        result = self.db_manager.fetch_all(
+            "SELECT id, name, birthday, sex, room FROM Students"
+        )
         expected = [
             (6, "Frank", "1998-06-06T00:00:00.000000", "M", 1),
             (7, "Grace", "2000-07-07T00:00:00.000000", "F", 1),
         ]
         self.assertEqual(result, expected)
 
+    def test_birthday_julian_is_generated(self):
+        result = self.db_manager.fetch_all(
+            "SELECT birthday_julian FROM Students WHERE id = 1"
+        )
+        self.assertEqual(result, [(2451544.5,)])
+
+    @patch("db_manager._INSERT_CHUNK_SIZE", 1)
+    def test_insert_students_from_generator_in_chunks(self):
+        self.db_manager.clear_tables()
+        self.db_manager.insert_rooms(room for room in [(1, "Room F")])
+        students = [
+            (6, "Frank", "1998-06-06T00:00:00.000000", "M", 1),
+            (7, "Grace", "2000-07-07T00:00:00.000000", "F", 1),
+        ]
+        self.db_manager.insert_students(student for student in students)
+        result = self.db_manager.fetch_all(
+            "SELECT id, name, birthday, sex, room FROM Students"
+        )
+        self.assertEqual(result, students)
+
+    def test_insert_rooms_without_waiting(self):
+        self.db_manager.clear_tables()
+        futures = self.db_manager.insert_rooms([(4, "Room D"), (5, "Room E")], wait=False)
+        self.assertEqual(sum(future.result() for future in futures), 2)
+        result = self.db_manager.fetch_all("SELECT * FROM Rooms")
+        self.assertEqual(result, [(4, "Room D"), (5, "Room E")])
+
+    def test_failed_insert_keeps_other_calls(self):
+        self.db_manager.clear_tables()
+        with self.db_manager._write_lock:
+            kept = self.db_manager.insert_rooms([(4, "Room D")], wait=False)
+            failed = self.db_manager.insert_rooms(
+                [(5, "Room E"), (5, "Room F")], wait=False
+            )
+        self.assertEqual(kept[0].result(), 1)
+        with self.assertRaises(Error):
+            failed[0].result()
+        self.assertEqual(
+            self.db_manager.fetch_all("SELECT * FROM Rooms"), [(4, "Room D")]
+        )
+
     def test_insert_rooms_with_duplicate_id(self):
         self.db_manager.clear_tables()
         self.db_manager.insert_rooms([(1, "Room D")])
         with self.assertRaises(Error):
             self.db_manager.insert_rooms([(1, "Room E")])
 
+    def test_insert_rooms_with_wrong_row_length(self):
+        self.db_manager.clear_tables()
+        with self.assertRaises(Error):
+            self.db_manager.insert_rooms([(1, "Room D"), (2, "Room E", "extra"), (3,)])
+        self.assertEqual(self.db_manager.fetch_all("SELECT * FROM Rooms"), [])
+
+    def test_bulk_load_respects_variable_limit(self):
+        self.db_manager.clear_tables()
+        limit = self.db_manager.connection.getlimit(SQLITE_LIMIT_VARIABLE_NUMBER)
+        try:
+            self.db_manager.connection.setlimit(SQLITE_LIMIT_VARIABLE_NUMBER, 9)
+            rooms = [(i, f"Room #{i}") for i in range(12)]
+            self.assertEqual(self.db_manager.bulk_load(rooms, []), (12, 0))
+        finally:
+            self.db_manager.connection.setlimit(SQLITE_LIMIT_VARIABLE_NUMBER, limit)
+
     def test_insert_students_with_duplicate_id(self):
         self.db_manager.clear_tables()
         rooms = [(1, "Room F")]
@@ -106,6 +209,107 @@ class TestDbManager(unittest.TestCase):
         with self.assertRaises(Error):
             self.db_manager.insert_students(students)
 
+    def test_analyze(self):
+        self.db_manager.analyze()
+        result = self.db_manager.fetch_all("SELECT tbl FROM sqlite_stat1")
+        self.assertIn(("Students",), result)
+
+    def test_bulk_load(self):
+        self.db_manager.clear_tables()
+        students = [
+            (6, "Frank", "1998-06-06T00:00:00.000000", "M", 1),
+            (7, "Grace", "2000-07-07T00:00:00.000000", "F", 1),
+        ]
+        counts = self.db_manager.bulk_load(
+            (room for room in [(1, "Room F")]), (student for student in students)
+        )
+        self.assertEqual(counts, (1, 2))
+        result = self.db_manager.fetch_all(
+            "SELECT id, name, birthday, sex, room FROM Students"
+        )
+        self.assertEqual(result, students)
+        result = self.db_manager.fetch_all("SELECT idx FROM sqlite_stat1")
+        self.assertIn(("idx_students_room_birthday",), result)
+        self.assertEqual(self.db_manager.task1(), [("Room F", 2)])
+
+    def test_bulk_load_restores_wal_autocheckpoint(self):
+        self.db_manager.clear_tables()
+        self.db_manager.bulk_load([(1, "Room F")], [])
+        result = self.db_manager.connection.execute(
+            "PRAGMA wal_autocheckpoint"
+        ).fetchone()
+        self.assertEqual(result, (1000,))
+
+    def test_bulk_load_rolls_back_on_error(self):
+        self.db_manager.clear_tables()
+        students = [
+            (6, "Frank", "1998-06-06T00:00:00.000000", "M", 1),
+            (6, "Grace", "2000-07-07T00:00:00.000000", "F", 1),
+        ]
+        with self.assertRaises(Error):
+            self.db_manager.bulk_load([(1, "Room F")], students)
+        self.assertEqual(self.db_manager.fetch_all("SELECT * FROM Rooms"), [])
+
+    def test_bulk_load_rejects_missing_room(self):
+        self.db_manager.clear_tables()
+        students = [(6, "Frank", "1998-06-06T00:00:00.000000", "M", 2)]
+        with self.assertRaises(IntegrityError):
+            self.db_manager.bulk_load([(1, "Room F")], students)
+        self.assertEqual(self.db_manager.fetch_all("SELECT * FROM Rooms"), [])
+
+    def test_create_indexes_analyzes(self):
+        self.db_manager.create_indexes()
+        result = self.db_manager.fetch_all("SELECT idx FROM sqlite_stat1")
+        self.assertIn(("idx_students_room_sex",), result)
+
+    def test_flush(self):
+        self.db_manager.insert_rooms([(99, "Room #99")])
+        self.db_manager.flush()
+        self.assertEqual(os.path.getsize(f"{self.db_path}-wal"), 0)
+
+    def test_context_manager_closes_connections(self):
+        with DbManager(db_path=self.db_path, read_pool_size=1) as db_manager:
+            self.assertEqual(len(db_manager.task1()), 3)
+        self.assertIsNone(db_manager.connection)
+        db_manager.close()
+
+    def test_reads_without_read_pool(self):
+        with DbManager(db_path=self.db_path, read_pool_size=0) as db_manager:
+            self.assertEqual(len(db_manager.task1()), 3)
+            with self.assertRaises(Error):
+                db_manager.fetch_all("DELETE FROM Rooms")
+        self.assertEqual(len(self.db_manager.fetch_all("SELECT * FROM Rooms")), 3)
+
+    def test_in_memory_database(self):
+        with DbManager(db_path=":memory:") as db_manager:
+            db_manager.execute_query("CREATE TABLE Numbers (value INTEGER)")
+            db_manager.execute_query("INSERT INTO Numbers VALUES (1)")
+            self.assertEqual(db_manager.fetch_all("SELECT value FROM Numbers"), [(1,)])
+
+    def test_migrates_old_schema(self):
+        with tempfile.TemporaryDirectory() as directory:
+            db_path = os.path.join(directory, "old.db")
+            connection = sqlite3.connect(db_path)
+            connection.executescript(
+                """
+                CREATE TABLE Rooms (id INTEGER PRIMARY KEY NOT NULL, name TEXT NOT NULL);
+                CREATE TABLE Students (
+                    id INTEGER PRIMARY KEY NOT NULL,
+                    name TEXT NOT NULL,
+                    birthday DATETIME NOT NULL,
+                    sex TEXT NOT NULL,
+                    room INTEGER NOT NULL,
+                    FOREIGN KEY (room) REFERENCES Rooms(id)
+                );
+                """
+            )
+            connection.close()
+            students = [(6, "Frank", "1998-06-06T00:00:00.000000", "M", 1)]
+            with DbManager(db_path=db_path) as db_manager:
+                db_manager.bulk_load([(1, "Room F")], students)
+                self.assertEqual(db_manager.task1(), [("Room F", 1)])
+                self.assertEqual(db_manager.fetch_all("PRAGMA user_version"), [(1,)])
+
     def test_execute_invalid_query(self):
         with self.assertRaises(Error):
             self.db_manager.execute_query("INVALID SQL QUERY")
@@ -114,6 +318,11 @@ class TestDbManager(unittest.TestCase):
         with self.assertRaises(Error):
             self.db_manager.fetch_all("INVALID SQL QUERY")
 
+    def test_fetch_all_is_read_only(self):
+        with self.assertRaises(Error):
+            self.db_manager.fetch_all("DELETE FROM Rooms")
+        self.assertEqual(len(self.db_manager.fetch_all("SELECT * FROM Rooms")), 3)
+
     def test_clear_tables(self):
         result_rooms = self.db_manager.fetch_all("SELECT * FROM Rooms")
         result_students = self.db_manager.fetch_all("SELECT * FROM Students")
@@ -126,10 +335,10 @@ class TestDbManager(unittest.TestCase):
         self.assertEqual(result_students, [])
         try:
             self.db_manager.execute_query(
-                "CREATE INDEX idx_students_room ON Students(room);"
+                "CREATE INDEX idx_students_room_birthday ON Students(room, birthday_julian);"
             )
             self.db_manager.execute_query(
-                "CREATE INDEX idx_students_birthday ON Students(birthday);"
+                "CREATE INDEX idx_students_room_sex ON Students(room, sex);"
             )
         except Error as e:
             self.fail(f"Indexes were not properly dropped: {e}")
@@ -38,7 +38,7 @@ class JsonParserTest(unittest.TestCase):
         mock_file.return_value.read.return_value = self.rooms_data
         expected = [(0, "Room #0"), (1, "Room #1")]
         result = read_rooms_file("fake_path")
-        self.assertEqual(result, expected)
+        self.assertEqual(list(result), expected)
 
     @patch("builtins.open", new_callable=mock_open)
     def test_read_students_file(self, mock_file):
@@ -48,7 +48,28 @@ class JsonParserTest(unittest.TestCase):
             (1, "John Doe", "2010-05-15T00:00:00.000000", "F", 474),
         ]
         result = read_students_file("fake_path")
-        self.assertEqual(result, expected)
+        self.assertEqual(list(result), expected)
+
+    @patch("builtins.open", new_callable=mock_open)
+    def test_read_rooms_file_non_int64_ids(self, mock_file):
+        mock_file.return_value.read.return_value = json.dumps(
+            [
+                {"id": "7", "name": "Room #7"},
+                {"id": None, "name": "Room"},
+                {"id": 2**63, "name": "Big"},
+            ]
+        )
+        expected = [("7", "Room #7"), (None, "Room"), (2**63, "Big")]
+        result = read_rooms_file("fake_path")
+        self.assertEqual(list(result), expected)
+
+    @patch("builtins.open", new_callable=mock_open)
+    def test_read_students_file_string_room(self, mock_file):
+        students = json.loads(self.students_data)
+        students[1]["room"] = "474"
+        mock_file.return_value.read.return_value = json.dumps(students)
+        result = list(read_students_file("fake_path"))
+        self.assertEqual([row[4] for row in result], [473, "474"])
 
     @patch("builtins.open", new_callable=mock_open)
     def test_read_rooms_file_exception(self, mock_file):
@@ -74,6 +95,12 @@ class JsonParserTest(unittest.TestCase):
         result = read_students_file("fake_path")
         self.assertIsNone(result)
 
+    @patch("builtins.open", new_callable=mock_open)
+    def test_read_students_file_missing_field(self, mock_file):
+        mock_file.return_value.read.return_value = json.dumps([{"id": 0, "name": "X"}])
+        with self.assertRaises(KeyError):
+            read_students_file("fake_path")
+
     @patch("builtins.open", new_callable=mock_open, read_data="Not a JSON")
     def test_read_rooms_file_invalid_json(self, mock_file):
         with self.assertRaises(json.JSONDecodeError):
@@ -0,0 +1,28 @@
+import logging
+import unittest
+from unittest.mock import patch
+
+from log_settings import env_log_level
+
+
+class LogSettingsTest(unittest.TestCase):
+
+    @patch.dict("os.environ", {"LOG_LEVEL": "info"})
+    def test_env_log_level_name(self):
+        self.assertEqual(env_log_level(), logging.INFO)
+
+    @patch.dict("os.environ", {"LOG_LEVEL": "10"})
+    def test_env_log_level_number(self):
+        self.assertEqual(env_log_level(), logging.DEBUG)
+
+    @patch.dict("os.environ", {"LOG_LEVEL": "verbose"})
+    def test_env_log_level_unknown(self):
+        self.assertEqual(env_log_level(), logging.WARNING)
+
+    @patch.dict("os.environ", {}, clear=True)
+    def test_env_log_level_unset(self):
+        self.assertEqual(env_log_level(), logging.WARNING)
+
+
+if __name__ == "__main__":
+    unittest.main()
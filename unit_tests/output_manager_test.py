@@ -1,3 +1,4 @@
+import io
 import json
 import os
 import unittest
@@ -12,9 +13,14 @@ class OutputManagerTest(unittest.TestCase):
         self.json_data = [(0, "Room #0"), (1, "Room #1")]
         self.xml_data = [(0, "Room #0"), (1, "Room #1")]
         self.task_number = "task1"
-        self.json_content = json.dumps(self.json_data, indent=4, ensure_ascii=False)
+        self.json_content = json.dumps(
+            self.json_data, ensure_ascii=False, separators=(",", ":")
+        )
+        self.pretty_json_content = json.dumps(
+            self.json_data, indent=2, ensure_ascii=False
+        )
         self.xml_content = (
-            '<?xml version="1.0" ?>\n'
+            "<?xml version='1.0' encoding='UTF-8'?>\n"
             "<root>\n"
             "    <data>\n"
             "        <item_0>0</item_0>\n"
@@ -35,18 +41,64 @@ class OutputManagerTest(unittest.TestCase):
         if os.path.exists(self.xml_file_path):
             os.remove(self.xml_file_path)
 
+    def write_to_stream(self, output_func, data, **kwargs):
+        stream = io.BytesIO()
+        self.assertIsNone(output_func(data, self.task_number, stream=stream, **kwargs))
+        return stream.getvalue().decode("utf-8")
+
     def test_output_json_content(self):
+        content = self.write_to_stream(output_json, self.json_data)
+        self.assertEqual(content, self.json_content)
+
+    def test_output_json_pretty_content(self):
+        content = self.write_to_stream(output_json, self.json_data, pretty=True)
+        self.assertEqual(content, self.pretty_json_content)
+
+    def test_output_json_file_content(self):
         result_path = output_json(self.json_data, self.task_number)
         with open(result_path, "r", encoding="utf-8") as file:
             content = file.read()
         self.assertEqual(content, self.json_content)
 
+    def test_output_json_content_nested_values(self):
+        data = [("Комната №1", 1.5, [1, 2]), ("Room\n#2", None, [])]
+        content = self.write_to_stream(output_json, data, non_ascii=True)
+        self.assertEqual(
+            content, json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        )
+        content = self.write_to_stream(output_json, data, pretty=True, non_ascii=True)
+        self.assertEqual(content, json.dumps(data, indent=2, ensure_ascii=False))
+        content = self.write_to_stream(output_json, data)
+        self.assertEqual(json.loads(content), json.loads(json.dumps(data)))
+
+    @patch("output_manager._JSON_BLOCK_ROWS", 1)
+    def test_output_json_content_in_blocks(self):
+        content = self.write_to_stream(output_json, self.json_data)
+        self.assertEqual(content, self.json_content)
+        content = self.write_to_stream(output_json, self.json_data, pretty=True)
+        self.assertEqual(content, self.pretty_json_content)
+
     def test_output_xml_content(self):
+        content = self.write_to_stream(output_xml, self.xml_data)
+        self.assertEqual(content.strip(), self.xml_content.strip())
+
+    def test_output_xml_file_content(self):
         result_path = output_xml(self.xml_data, self.task_number)
         with open(result_path, "r", encoding="utf-8") as file:
             content = file.read()
         self.assertEqual(content.strip(), self.xml_content.strip())
 
+    def test_output_paths_use_given_cwd(self):
+        cwd = os.getcwd()
+        self.assertEqual(
+            output_json(self.json_data, self.task_number, cwd),
+            os.path.join(cwd, self.json_file_path),
+        )
+        self.assertEqual(
+            output_xml(self.xml_data, self.task_number, cwd),
+            os.path.join(cwd, self.xml_file_path),
+        )
+
     @patch("builtins.open", new_callable=mock_open)
     def test_output_json_exception(self, mock_file):
         mock_file.side_effect = IOError("File not found")
@@ -59,6 +111,18 @@ class OutputManagerTest(unittest.TestCase):
         with self.assertRaises(OSError):
             output_xml(self.xml_data, self.task_number)
 
+    def test_output_json_unserializable_data(self):
+        with self.assertRaises(TypeError):
+            output_json([(0, object())], self.task_number)
+
+    def test_output_json_unserializable_data_keeps_existing_file(self):
+        result_path = output_json(self.json_data, self.task_number)
+        with self.assertRaises(TypeError):
+            output_json([(0, "Room #0"), (1, object())], self.task_number)
+        with open(result_path, "r", encoding="utf-8") as file:
+            self.assertEqual(file.read(), self.json_content)
+        self.assertFalse(os.path.exists(f"{self.json_file_path}.tmp"))
+
     def test_output_json_empty_data(self):
         result_path = output_json([], self.task_number)
         self.assertIsNone(result_path)